@@ -14,13 +14,20 @@ Features:
 """
 
 import os
+import html
 import time
+import queue
+import threading
+from string import Template
 import streamlit as st
-from pathlib import Path
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import HumanMessage
 
 # Import your RAG utilities
-from rag_utils import load_and_chunk, build_store, init_groq, prompt_tpl
+from rag_utils import (
+    load_and_chunk, build_store, init_groq, prompt_tpl,
+    similarity_search_by_vectors, to_gpu, DEFAULT_GROQ_API_KEY,
+)
+from styles import CSS
 
 
 # ==============================================================================
@@ -40,741 +47,161 @@ st.set_page_config(
 if "theme" not in st.session_state:
     st.session_state.theme = "dark"
 
+# Chat history as (role, content) tuples, role is "user" or "assistant"
 if "history" not in st.session_state:
     st.session_state.history = []
 
 if "last_docs" not in st.session_state:
     st.session_state.last_docs = []
 
+# Suggestion clicked on the welcome screen, answered on the next rerun
+if "pending_query" not in st.session_state:
+    st.session_state.pending_query = None
+
 
 # ==============================================================================
-# ENHANCED THEME CONFIGURATION
+# HELPERS
 # ==============================================================================
-THEMES = {
-    "dark": {
-        "bg": "#0f0f0f",
-        "bg_gradient": "radial-gradient(ellipse at top, #1a1a2e 0%, #0f0f0f 50%)",
-        "sidebar_bg": "#161616",
-        "sidebar_border": "#2a2a2a",
-        "card_bg": "#1e1e1e",
-        "card_hover": "#252525",
-        "input_bg": "#1e1e1e",
-        "input_focus": "#252525",
-        "border": "#2a2a2a",
-        "border_hover": "#3a3a3a",
-        "text": "#f5f5f5",
-        "text_secondary": "#a0a0a0",
-        "text_muted": "#666666",
-        "accent": "#00d4aa",
-        "accent_hover": "#00f5c4",
-        "accent_subtle": "rgba(0, 212, 170, 0.1)",
-        "user_avatar_bg": "linear-gradient(135deg, #00d4aa 0%, #00a085 100%)",
-        "bot_avatar_bg": "linear-gradient(135deg, #2a2a3e 0%, #1a1a2e 100%)",
-        "shadow_sm": "0 2px 8px rgba(0, 0, 0, 0.3)",
-        "shadow_md": "0 4px 16px rgba(0, 0, 0, 0.4)",
-        "shadow_lg": "0 8px 32px rgba(0, 0, 0, 0.5)",
-        "glow": "0 0 20px rgba(0, 212, 170, 0.15)",
-    },
-    "light": {
-        "bg": "#fafbfc",
-        "bg_gradient": "linear-gradient(180deg, #ffffff 0%, #f0f4f8 100%)",
-        "sidebar_bg": "#ffffff",
-        "sidebar_border": "#e8edf3",
-        "card_bg": "#ffffff",
-        "card_hover": "#f8fafc",
-        "input_bg": "#ffffff",
-        "input_focus": "#f8fafc",
-        "border": "#e2e8f0",
-        "border_hover": "#cbd5e1",
-        "text": "#1e293b",
-        "text_secondary": "#64748b",
-        "text_muted": "#94a3b8",
-        "accent": "#0891b2",
-        "accent_hover": "#06b6d4",
-        "accent_subtle": "rgba(8, 145, 178, 0.08)",
-        "user_avatar_bg": "linear-gradient(135deg, #0891b2 0%, #0e7490 100%)",
-        "bot_avatar_bg": "linear-gradient(135deg, #f1f5f9 0%, #e2e8f0 100%)",
-        "shadow_sm": "0 1px 3px rgba(0, 0, 0, 0.08), 0 1px 2px rgba(0, 0, 0, 0.04)",
-        "shadow_md": "0 4px 12px rgba(0, 0, 0, 0.08), 0 2px 4px rgba(0, 0, 0, 0.04)",
-        "shadow_lg": "0 8px 24px rgba(0, 0, 0, 0.1), 0 4px 8px rgba(0, 0, 0, 0.04)",
-        "glow": "0 0 20px rgba(8, 145, 178, 0.1)",
-    }
+@st.cache_data(ttl=5, show_spinner=False)
+def _list_txt(folder: str, mtime: float) -> list[str]:
+    """List .txt files in folder. mtime is only a cache key so edits invalidate it."""
+    with os.scandir(folder) as it:
+        return [e.path for e in it if e.name.endswith(".txt") and e.is_file()]
+
+
+def _folder_fingerprint(paths: list[str]) -> tuple:
+    """Cheap content fingerprint (name, mtime, size) used to key the vector store cache."""
+    fp = []
+    for p in paths:
+        try:
+            stat = os.stat(p)
+        except FileNotFoundError:
+            continue
+        fp.append((os.path.basename(p), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(fp))
+
+
+def _section_header(label: str):
+    """Emit a sidebar divider and section label in a single markdown call."""
+    st.markdown(
+        f'<div class="divider"></div><p class="section-label">{label}</p>',
+        unsafe_allow_html=True
+    )
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _source_card_html(idx: int, source_name: str, text: str) -> str:
+    """Escaped HTML for one retrieved chunk. Top-k chunks recur across turns, so memoize."""
+    preview = text[:400] + ("..." if len(text) > 400 else "")
+    return f"""
+        <div class="source-card">
+            <div class="source-card-title">{idx}. {html.escape(source_name)}</div>
+            <div class="source-card-content">{html.escape(preview)}</div>
+        </div>
+    """
+
+
+# Chat message shells per role, built once; $content must already be escaped
+_MESSAGE_TMPL = {
+    role: Template(
+        f'<div class="message-row"><div class="message-avatar {role}">{avatar}</div>'
+        '<div class="message-content">$content</div></div>'
+    )
+    for role, avatar in (("user", "👤"), ("assistant", "🤖"))
 }
 
-# Get current theme colors
-theme = THEMES[st.session_state.theme]
-is_dark = st.session_state.theme == "dark"
 
+def _message_html(role: str, content: str, suffix: str = "") -> str:
+    """HTML for one chat message; suffix is trusted HTML appended after the text."""
+    return _MESSAGE_TMPL[role].substitute(content=html.escape(content) + suffix)
 
-# ==============================================================================
-# ENHANCED CSS STYLING
-# ==============================================================================
-st.markdown(f"""
-<style>
-    /* ========== FONTS ========== */
-    @import url('https://fonts.googleapis.com/css2?family=Plus+Jakarta+Sans:wght@400;500;600;700&family=JetBrains+Mono:wght@400;500&display=swap');
-    
-    * {{
-        font-family: 'Plus Jakarta Sans', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-    }}
-    
-    code, pre, .stCode {{
-        font-family: 'JetBrains Mono', monospace !important;
-    }}
-    
-    /* ========== MAIN BACKGROUND ========== */
-    .stApp {{
-        background: {theme["bg_gradient"]};
-        background-attachment: fixed;
-    }}
-    
-    /* ========== SIDEBAR ========== */
-    [data-testid="stSidebar"] {{
-        background: {theme["sidebar_bg"]};
-        border-right: 1px solid {theme["sidebar_border"]};
-        box-shadow: {theme["shadow_md"]};
-    }}
-    
-    [data-testid="stSidebar"] > div:first-child {{
-        padding: 1.5rem 1rem;
-    }}
-    
-    /* Sidebar text */
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] p,
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] span {{
-        color: {theme["text_secondary"]};
-    }}
-    
-    [data-testid="stSidebar"] h1, 
-    [data-testid="stSidebar"] h2, 
-    [data-testid="stSidebar"] h3 {{
-        color: {theme["text"]} !important;
-    }}
-    
-    /* ========== SIDEBAR TITLE ========== */
-    .sidebar-title {{
-        display: flex;
-        align-items: center;
-        gap: 10px;
-        margin-bottom: 4px;
-    }}
-    
-    .sidebar-title-icon {{
-        font-size: 24px;
-    }}
-    
-    .sidebar-title-text {{
-        color: {theme["text"]};
-        font-size: 18px;
-        font-weight: 700;
-        letter-spacing: -0.3px;
-    }}
-    
-    .sidebar-subtitle {{
-        color: {theme["text_muted"]};
-        font-size: 13px;
-        margin-left: 34px;
-        margin-top: -2px;
-    }}
-    
-    /* ========== SECTION LABELS ========== */
-    .section-label {{
-        color: {theme["text_muted"]};
-        font-size: 11px;
-        font-weight: 700;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        margin: 24px 0 12px 0;
-        padding-left: 2px;
-    }}
-    
-    /* ========== STATUS INDICATORS ========== */
-    .status-container {{
-        display: flex;
-        align-items: center;
-        gap: 10px;
-        margin: 10px 0;
-        padding: 10px 14px;
-        background: {theme["accent_subtle"]};
-        border-radius: 10px;
-        border: 1px solid {"rgba(0, 212, 170, 0.2)" if is_dark else "rgba(8, 145, 178, 0.15)"};
-    }}
-    
-    .status-container.offline {{
-        background: {"rgba(239, 68, 68, 0.1)" if is_dark else "rgba(239, 68, 68, 0.06)"};
-        border-color: {"rgba(239, 68, 68, 0.2)" if is_dark else "rgba(239, 68, 68, 0.15)"};
-    }}
-    
-    .status-dot {{
-        width: 8px;
-        height: 8px;
-        border-radius: 50%;
-        flex-shrink: 0;
-        animation: pulse 2s infinite;
-    }}
-    
-    .status-dot.online {{
-        background-color: {theme["accent"]};
-        box-shadow: 0 0 8px {theme["accent"]};
-    }}
-    
-    .status-dot.offline {{
-        background-color: #ef4444;
-        animation: none;
-    }}
-    
-    @keyframes pulse {{
-        0%, 100% {{ opacity: 1; }}
-        50% {{ opacity: 0.5; }}
-    }}
-    
-    .status-text {{
-        color: {theme["text_secondary"]};
-        font-size: 13px;
-        font-weight: 500;
-    }}
-    
-    /* ========== DIVIDER ========== */
-    .divider {{
-        height: 1px;
-        background: {"linear-gradient(90deg, transparent, " + theme["border"] + ", transparent)"};
-        margin: 20px 0;
-        border: none;
-    }}
-    
-    /* ========== HEADER ========== */
-    .chat-header {{
-        text-align: center;
-        padding: 32px 20px;
-        margin-bottom: 24px;
-        background: {theme["card_bg"]};
-        border-radius: 16px;
-        border: 1px solid {theme["border"]};
-        box-shadow: {theme["shadow_sm"]};
-        max-width: 800px;
-        margin-left: auto;
-        margin-right: auto;
-    }}
-    
-    .chat-header-title {{
-        color: {theme["text"]};
-        font-size: 22px;
-        font-weight: 700;
-        margin: 0;
-        letter-spacing: -0.5px;
-    }}
-    
-    .chat-header-subtitle {{
-        color: {theme["text_secondary"]};
-        font-size: 14px;
-        margin: 8px 0 0 0;
-        font-weight: 500;
-    }}
-    
-    /* ========== WELCOME SCREEN ========== */
-    .welcome-container {{
-        text-align: center;
-        padding: 80px 24px;
-        max-width: 640px;
-        margin: 0 auto;
-    }}
-    
-    .welcome-icon {{
-        font-size: 56px;
-        margin-bottom: 24px;
-        display: block;
-    }}
-    
-    .welcome-title {{
-        color: {theme["text"]};
-        font-size: 32px;
-        font-weight: 700;
-        margin: 0 0 16px 0;
-        letter-spacing: -0.5px;
-        line-height: 1.2;
-    }}
-    
-    .welcome-subtitle {{
-        color: {theme["text_secondary"]};
-        font-size: 16px;
-        margin: 0;
-        line-height: 1.6;
-        font-weight: 500;
-    }}
-    
-    .welcome-link {{
-        color: {theme["accent"]};
-        text-decoration: none;
-        font-weight: 600;
-        transition: all 0.2s ease;
-    }}
-    
-    .welcome-link:hover {{
-        color: {theme["accent_hover"]};
-        text-decoration: underline;
-    }}
-    
-    /* ========== CHAT MESSAGES ========== */
-    .messages-container {{
-        max-width: 800px;
-        margin: 0 auto;
-        padding: 0 16px;
-    }}
-    
-    .message-row {{
-        display: flex;
-        gap: 16px;
-        padding: 28px 24px;
-        margin: 12px 0;
-        background: {theme["card_bg"]};
-        border-radius: 16px;
-        border: 1px solid {theme["border"]};
-        box-shadow: {theme["shadow_sm"]};
-        transition: all 0.2s ease;
-    }}
-    
-    .message-row:hover {{
-        box-shadow: {theme["shadow_md"]};
-        border-color: {theme["border_hover"]};
-    }}
-    
-    .message-avatar {{
-        width: 40px;
-        height: 40px;
-        border-radius: 12px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 18px;
-        flex-shrink: 0;
-        box-shadow: {theme["shadow_sm"]};
-    }}
-    
-    .message-avatar.user {{
-        background: {theme["user_avatar_bg"]};
-        color: white;
-    }}
-    
-    .message-avatar.assistant {{
-        background: {theme["bot_avatar_bg"]};
-        border: 1px solid {theme["border"]};
-    }}
-    
-    .message-content {{
-        flex: 1;
-        color: {theme["text"]};
-        font-size: 15px;
-        line-height: 1.75;
-        padding-top: 8px;
-    }}
-    
-    .message-meta {{
-        color: {theme["text_muted"]};
-        font-size: 12px;
-        margin-top: 12px;
-        padding-top: 12px;
-        border-top: 1px solid {theme["border"]};
-        font-weight: 500;
-    }}
-    
-    /* ========== SUGGESTION BUTTONS ========== */
-    .suggestions-grid {{
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 12px;
-        margin-top: 40px;
-        max-width: 700px;
-        margin-left: auto;
-        margin-right: auto;
-    }}
-    
-    /* ========== INPUT FIELDS ========== */
-    .stTextInput > div > div > input {{
-        background: {theme["input_bg"]} !important;
-        border: 2px solid {theme["border"]} !important;
-        border-radius: 12px !important;
-        color: {theme["text"]} !important;
-        font-size: 14px !important;
-        padding: 12px 16px !important;
-        font-weight: 500 !important;
-        transition: all 0.2s ease !important;
-        box-shadow: {theme["shadow_sm"]} !important;
-    }}
-    
-    .stTextInput > div > div > input:focus {{
-        border-color: {theme["accent"]} !important;
-        box-shadow: {theme["glow"]} !important;
-        background: {theme["input_focus"]} !important;
-    }}
-    
-    .stTextInput > div > div > input::placeholder {{
-        color: {theme["text_muted"]} !important;
-    }}
-    
-    /* ========== SELECT BOX ========== */
-    .stSelectbox > div > div {{
-        background: {theme["input_bg"]} !important;
-        border: 2px solid {theme["border"]} !important;
-        border-radius: 12px !important;
-        box-shadow: {theme["shadow_sm"]} !important;
-    }}
-    
-    .stSelectbox > div > div:hover {{
-        border-color: {theme["border_hover"]} !important;
-    }}
-    
-    .stSelectbox > div > div > div {{
-        color: {theme["text"]} !important;
-        font-weight: 500 !important;
-    }}
-    
-    .stSelectbox label {{
-        color: {theme["text_secondary"]} !important;
-        font-weight: 600 !important;
-    }}
-    
-    /* ========== SLIDERS ========== */
-    .stSlider label {{
-        color: {theme["text_secondary"]} !important;
-        font-size: 13px !important;
-        font-weight: 600 !important;
-    }}
-    
-    .stSlider > div > div > div > div {{
-        background: {theme["border"]} !important;
-    }}
-    
-    .stSlider > div > div > div > div > div {{
-        background: {theme["accent"]} !important;
-    }}
-    
-    /* ========== BUTTONS ========== */
-    .stButton > button {{
-        background: {theme["card_bg"]} !important;
-        color: {theme["text"]} !important;
-        border: 2px solid {theme["border"]} !important;
-        border-radius: 12px !important;
-        font-size: 14px !important;
-        font-weight: 600 !important;
-        padding: 10px 20px !important;
-        transition: all 0.2s ease !important;
-        box-shadow: {theme["shadow_sm"]} !important;
-    }}
-    
-    .stButton > button:hover {{
-        background: {theme["card_hover"]} !important;
-        border-color: {theme["accent"]} !important;
-        box-shadow: {theme["shadow_md"]} !important;
-        transform: translateY(-1px) !important;
-    }}
-    
-    .stButton > button:active {{
-        transform: translateY(0) !important;
-    }}
-    
-    /* Primary action button style */
-    .primary-btn > button {{
-        background: {theme["user_avatar_bg"]} !important;
-        color: white !important;
-        border: none !important;
-    }}
-    
-    .primary-btn > button:hover {{
-        filter: brightness(1.1) !important;
-    }}
-    
-    /* ========== RADIO BUTTONS (Theme Toggle) ========== */
-    .stRadio > div {{
-        gap: 8px !important;
-        background: {theme["card_bg"]};
-        padding: 8px;
-        border-radius: 12px;
-        border: 1px solid {theme["border"]};
-    }}
-    
-    .stRadio label {{
-        color: {theme["text"]} !important;
-        font-weight: 500 !important;
-    }}
-    
-    .stRadio > div > label > div:first-child {{
-        background-color: {theme["accent"]} !important;
-    }}
-    
-    /* ========== CHAT INPUT ========== */
-    [data-testid="stChatInput"] > div {{
-        background: {theme["input_bg"]} !important;
-        border: 2px solid {theme["border"]} !important;
-        border-radius: 16px !important;
-        box-shadow: {theme["shadow_md"]} !important;
-        transition: all 0.2s ease !important;
-    }}
-    
-    [data-testid="stChatInput"] > div:focus-within {{
-        border-color: {theme["accent"]} !important;
-        box-shadow: {theme["glow"]}, {theme["shadow_md"]} !important;
-    }}
-    
-    [data-testid="stChatInput"] textarea {{
-        color: {theme["text"]} !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }}
-    
-    [data-testid="stChatInput"] textarea::placeholder {{
-        color: {theme["text_muted"]} !important;
-    }}
-    
-    /* ========== EXPANDER ========== */
-    .streamlit-expanderHeader {{
-        background: {theme["card_bg"]} !important;
-        border: 2px solid {theme["border"]} !important;
-        border-radius: 12px !important;
-        color: {theme["text_secondary"]} !important;
-        font-size: 14px !important;
-        font-weight: 600 !important;
-        padding: 14px 16px !important;
-        transition: all 0.2s ease !important;
-    }}
-    
-    .streamlit-expanderHeader:hover {{
-        color: {theme["text"]} !important;
-        border-color: {theme["accent"]} !important;
-        box-shadow: {theme["shadow_sm"]} !important;
-    }}
-    
-    .streamlit-expanderContent {{
-        background: {theme["sidebar_bg"]} !important;
-        border: 2px solid {theme["border"]} !important;
-        border-top: none !important;
-        border-radius: 0 0 12px 12px !important;
-        padding: 16px !important;
-    }}
-    
-    /* ========== SOURCE DOCUMENTS ========== */
-    .source-card {{
-        background: {theme["card_bg"]};
-        border: 2px solid {theme["border"]};
-        border-radius: 12px;
-        padding: 18px;
-        margin: 12px 0;
-        transition: all 0.2s ease;
-        box-shadow: {theme["shadow_sm"]};
-    }}
-    
-    .source-card:hover {{
-        border-color: {theme["accent"]};
-        box-shadow: {theme["shadow_md"]};
-    }}
-    
-    .source-card-title {{
-        color: {theme["accent"]};
-        font-size: 12px;
-        font-weight: 700;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        margin-bottom: 10px;
-        display: flex;
-        align-items: center;
-        gap: 8px;
-    }}
-    
-    .source-card-title::before {{
-        content: '📄';
-        font-size: 14px;
-    }}
-    
-    .source-card-content {{
-        color: {theme["text"]};
-        font-size: 14px;
-        line-height: 1.7;
-    }}
-    
-    /* ========== ALERTS ========== */
-    .stAlert {{
-        background: {theme["card_bg"]} !important;
-        border: 2px solid {theme["border"]} !important;
-        border-radius: 12px !important;
-        box-shadow: {theme["shadow_sm"]} !important;
-    }}
-    
-    /* ========== CHECKBOX ========== */
-    .stCheckbox label {{
-        color: {theme["text"]} !important;
-        font-weight: 500 !important;
-    }}
-    
-    .stCheckbox > label > div:first-child {{
-        background-color: {theme["card_bg"]} !important;
-        border: 2px solid {theme["border"]} !important;
-        border-radius: 6px !important;
-    }}
-    
-    /* ========== HIDE STREAMLIT DEFAULTS ========== */
-    #MainMenu {{ visibility: hidden; }}
-    footer {{ visibility: hidden; }}
-    header {{ visibility: hidden; }}
-    
-    /* ========== CUSTOM SCROLLBAR ========== */
-    ::-webkit-scrollbar {{
-        width: 10px;
-        height: 10px;
-    }}
-    
-    ::-webkit-scrollbar-track {{
-        background: {theme["bg"]};
-        border-radius: 5px;
-    }}
-    
-    ::-webkit-scrollbar-thumb {{
-        background: {theme["border"]};
-        border-radius: 5px;
-        border: 2px solid {theme["bg"]};
-    }}
-    
-    ::-webkit-scrollbar-thumb:hover {{
-        background: {theme["text_muted"]};
-    }}
-    
-    /* ========== API LINK ========== */
-    .api-link {{
-        display: inline-flex;
-        align-items: center;
-        gap: 6px;
-        color: {theme["accent"]};
-        font-size: 13px;
-        font-weight: 600;
-        text-decoration: none;
-        padding: 8px 14px;
-        background: {theme["accent_subtle"]};
-        border-radius: 8px;
-        border: 1px solid {"rgba(0, 212, 170, 0.2)" if is_dark else "rgba(8, 145, 178, 0.15)"};
-        transition: all 0.2s ease;
-        margin-top: 8px;
-    }}
-    
-    .api-link:hover {{
-        background: {"rgba(0, 212, 170, 0.2)" if is_dark else "rgba(8, 145, 178, 0.12)"};
-        transform: translateX(4px);
-    }}
-    
-    /* ========== FOOTER ========== */
-    .sidebar-footer {{
-        text-align: center;
-        padding: 16px;
-        margin-top: 20px;
-        background: {theme["accent_subtle"]};
-        border-radius: 12px;
-        border: 1px solid {"rgba(0, 212, 170, 0.15)" if is_dark else "rgba(8, 145, 178, 0.1)"};
-    }}
-    
-    .sidebar-footer p {{
-        color: {theme["text_secondary"]};
-        font-size: 12px;
-        margin: 0;
-        font-weight: 500;
-    }}
-    
-    .sidebar-footer a {{
-        color: {theme["accent"]};
-        text-decoration: none;
-        font-weight: 600;
-    }}
-    
-    .sidebar-footer a:hover {{
-        text-decoration: underline;
-    }}
-    
-    /* ========== DOC COUNT BADGE ========== */
-    .doc-badge {{
-        display: inline-flex;
-        align-items: center;
-        gap: 8px;
-        padding: 10px 14px;
-        background: {theme["accent_subtle"]};
-        border-radius: 10px;
-        border: 1px solid {"rgba(0, 212, 170, 0.2)" if is_dark else "rgba(8, 145, 178, 0.15)"};
-        margin-top: 8px;
-    }}
-    
-    .doc-badge-icon {{
-        font-size: 16px;
-    }}
-    
-    .doc-badge-text {{
-        color: {theme["text_secondary"]};
-        font-size: 13px;
-        font-weight: 600;
-    }}
-</style>
-""", unsafe_allow_html=True)
 
+def _messages_html(*rows: str) -> str:
+    """Wrap message rows in the messages container."""
+    return f'<div class="messages-container">{"".join(rows)}</div>'
 
-# ==============================================================================
-# SIDEBAR
-# ==============================================================================
-with st.sidebar:
-    # ----- Title -----
-    st.markdown(f"""
-        <div class="sidebar-title">
-            <span class="sidebar-title-icon"></span>
-            <span class="sidebar-title-text">RAG Chatbot</span>
-        </div>
-        <p class="sidebar-subtitle">Chat with your documents</p>
-    """, unsafe_allow_html=True)
-    
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
-    
-    # ----- Theme Toggle -----
-    st.markdown('<p class="section-label">Appearance</p>', unsafe_allow_html=True)
+
+# Theme radio label -> THEMES key
+_THEME_CHOICES = {" Dark": "dark", " Light": "light"}
+
+
+@st.fragment
+def _theme_picker():
+    """
+    Theme toggle plus the stylesheet it controls.
     
+    Running as a fragment means a theme flip only reruns this function
+    instead of the whole script (chat, retrieval, folder scan).
+    """
     theme_selection = st.radio(
         "Select theme",
-        options=[" Dark", " Light"],
+        options=list(_THEME_CHOICES),
         index=0 if st.session_state.theme == "dark" else 1,
         horizontal=True,
         label_visibility="collapsed"
     )
+    st.session_state.theme = _THEME_CHOICES[theme_selection]
     
-    # Update theme if changed
-    new_theme = "dark" if theme_selection == " Dark" else "light"
-    if new_theme != st.session_state.theme:
-        st.session_state.theme = new_theme
-        st.rerun()
-    
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
+    # <style> tags apply page-wide, so the CSS can live inside the fragment
+    st.markdown(CSS[st.session_state.theme], unsafe_allow_html=True)
+
+
+# Static sidebar HTML, sent as one block each instead of several markdown calls
+_SIDEBAR_HEADER_HTML = """
+    <div class="sidebar-title">
+        <span class="sidebar-title-icon"></span>
+        <span class="sidebar-title-text">RAG Chatbot</span>
+    </div>
+    <p class="sidebar-subtitle">Chat with your documents</p>
+    <div class="divider"></div>
+    <p class="section-label">Appearance</p>
+"""
+
+_SIDEBAR_FOOTER_HTML = """
+    <div class="divider"></div>
+    <div class="sidebar-footer">
+        <p>Built with ❤️ by <a href='https://github.com/MusaedAl-Fareh' target='_blank'>Musaed Al-Fareh</a></p>
+    </div>
+"""
+
+
+# ==============================================================================
+# SIDEBAR
+# ==============================================================================
+with st.sidebar:
+    # ----- Title & Theme Toggle -----
+    st.markdown(_SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
+    _theme_picker()
     
     # ----- API Key -----
-    st.markdown('<p class="section-label">API Configuration</p>', unsafe_allow_html=True)
+    _section_header("API Configuration")
     
     api_key = st.text_input(
         "Groq API Key",
         type="password",
-        value=os.getenv("GROQ_API_KEY", ""),
+        value=DEFAULT_GROQ_API_KEY,
         placeholder="Enter your Groq API key",
         label_visibility="collapsed"
     )
     
     if api_key:
-        st.markdown(f'''
+        st.markdown('''
             <div class="status-container">
                 <div class="status-dot online"></div>
                 <span class="status-text">API Connected</span>
             </div>
         ''', unsafe_allow_html=True)
     else:
-        st.markdown(f'''
+        st.markdown('''
             <div class="status-container offline">
                 <div class="status-dot offline"></div>
                 <span class="status-text">Not connected</span>
             </div>
+            <a href='https://console.groq.com' target='_blank' class='api-link'> Get free API key →</a>
         ''', unsafe_allow_html=True)
-        st.markdown(f"<a href='https://console.groq.com' target='_blank' class='api-link'> Get free API key →</a>", unsafe_allow_html=True)
-    
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     
     # ----- Model Selection -----
-    st.markdown('<p class="section-label">Model</p>', unsafe_allow_html=True)
+    _section_header("Model")
     
     model_options = [
         "meta-llama/llama-4-scout-17b-16e-instruct",
@@ -791,10 +218,8 @@ with st.sidebar:
         label_visibility="collapsed"
     )
     
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
-    
     # ----- Documents Folder -----
-    st.markdown('<p class="section-label">Documents</p>', unsafe_allow_html=True)
+    _section_header("Documents")
     
     data_folder = st.text_input(
         "Documents Folder",
@@ -804,8 +229,9 @@ with st.sidebar:
     )
     
     # Show document count
-    if Path(data_folder).exists():
-        txt_files = list(Path(data_folder).glob("*.txt"))
+    folder_exists = os.path.isdir(data_folder)
+    if folder_exists:
+        txt_files = _list_txt(data_folder, os.stat(data_folder).st_mtime)
         doc_count = len(txt_files)
         st.markdown(f'''
             <div class="doc-badge">
@@ -814,6 +240,7 @@ with st.sidebar:
             </div>
         ''', unsafe_allow_html=True)
     else:
+        txt_files = []
         st.markdown(f'''
             <div class="status-container offline">
                 <div class="status-dot offline"></div>
@@ -821,10 +248,8 @@ with st.sidebar:
             </div>
         ''', unsafe_allow_html=True)
     
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
-    
     # ----- RAG Parameters -----
-    st.markdown('<p class="section-label">RAG Settings</p>', unsafe_allow_html=True)
+    _section_header("RAG Settings")
     
     chunk_size = st.slider(
         "Chunk Size",
@@ -853,6 +278,7 @@ with st.sidebar:
     with st.expander(" Advanced Options"):
         show_sources = st.checkbox("Show source documents", value=True)
         show_debug = st.checkbox("Show debug info", value=False)
+        use_gpu_retrieval = st.checkbox("Use GPU for retrieval", value=False)
     
     st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     
@@ -871,14 +297,8 @@ with st.sidebar:
             st.session_state.last_docs = []
             st.rerun()
     
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
-    
     # ----- Footer -----
-    st.markdown(f"""
-        <div class="sidebar-footer">
-            <p>Built with ❤️ by <a href='https://github.com/MusaedAl-Fareh' target='_blank'>Musaed Al-Fareh</a></p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_SIDEBAR_FOOTER_HTML, unsafe_allow_html=True)
 
 
 # ==============================================================================
@@ -916,52 +336,184 @@ if not api_key:
     st.stop()
 
 # Check data folder
-if not Path(data_folder).exists():
+if not folder_exists:
     st.error(f" Folder not found: `{data_folder}`")
     st.info(" Create the folder and add some .txt files, or change the path in the sidebar.")
     st.stop()
 
-# Check for txt files
-txt_files = list(Path(data_folder).glob("*.txt"))
+# Check for txt files (listed once in the sidebar)
 if not txt_files:
     st.error(f" No .txt files found in `{data_folder}`")
     st.info(" Add some .txt documents to the folder.")
     st.stop()
 
 
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+MAX_HISTORY_TURNS = 10
+
+# Vector stores kept in memory (current and previous settings); each holds a
+# fully embedded corpus, so older folder/slider/document versions are evicted
+MAX_CACHED_STORES = 2
+
+# Minimum seconds between re-renders of a streaming reply
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Welcome-screen suggestions: (button label, query text, widget key)
+_SUGGESTIONS = [
+    ("📋 What services are available?", "What services are available?", "suggestion_0"),
+    ("💰 Tell me about the prices", "Tell me about the prices", "suggestion_1"),
+    ("🎯 What activities can I do?", "What activities can I do?", "suggestion_2"),
+]
+_SUGGESTION_QUERIES = {query for _, query, _ in _SUGGESTIONS}
+
+
+def _append_history(role: str, content: str):
+    """Append a message and drop the oldest ones beyond MAX_HISTORY_TURNS."""
+    h = st.session_state.history
+    h.append((role, content))
+    if len(h) > MAX_HISTORY_TURNS * 2:
+        del h[:len(h) - MAX_HISTORY_TURNS * 2]
+
+
+# Marks the end of a streamed reply in the token queue
+_STREAM_END = object()
+
+
+def _stream_reply(llm, prompt: str, render) -> str:
+    """
+    Stream the LLM reply, calling render(text_so_far) at most once per
+    STREAM_FLUSH_INTERVAL.
+    
+    A worker thread reads the stream into a queue while the script thread
+    renders (Streamlit elements may only be touched from the script thread),
+    so the socket keeps being read during a render; tokens that arrive
+    meanwhile go out together in the next one. If this function exits early,
+    the worker closes the stream at the next chunk.
+    
+    Returns:
+        The full reply; errors from the stream are re-raised
+    """
+    tokens = queue.Queue()
+    errors = []
+    stop = threading.Event()
+    
+    def produce():
+        stream = llm.stream([HumanMessage(content=prompt)])
+        try:
+            for chunk in stream:
+                if stop.is_set():
+                    break
+                if chunk.content:
+                    tokens.put(chunk.content)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stream.close()  # closes the HTTP stream when stopped early
+            tokens.put(_STREAM_END)
+    
+    threading.Thread(target=produce, daemon=True).start()
+    parts = []
+    last_flush = 0.0
+    finished = False
+    
+    # If the script is interrupted mid-reply (Stop, new input, a rerun raised
+    # inside render), tell the producer to stop reading the stream
+    try:
+        while not finished:
+            # Block for one token, then take everything queued meanwhile
+            # (e.g. during the last render) so it goes out in one render
+            batch = [tokens.get()]
+            while True:
+                try:
+                    batch.append(tokens.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STREAM_END:
+                finished = True
+                batch.pop()
+            parts.extend(batch)
+            
+            if finished or time.time() - last_flush < STREAM_FLUSH_INTERVAL:
+                continue
+            render("".join(parts))
+            last_flush = time.time()  # after the render, so slow renders throttle too
+    finally:
+        stop.set()
+    
+    if errors:
+        raise errors[0]
+    return "".join(parts)
+
+
 # ==============================================================================
 # LOAD RESOURCES (CACHED)
 # ==============================================================================
 
-@st.cache_resource(show_spinner=" Loading and indexing documents...")
-def get_vector_store(_folder, _chunk_size, _chunk_overlap):
-    """Load documents and create vector store."""
-    chunks, metas = load_and_chunk(_folder, _chunk_size, _chunk_overlap)
+@st.cache_resource(show_spinner=" Loading and indexing documents...", max_entries=MAX_CACHED_STORES)
+def get_vector_store(folder, chunk_size, chunk_overlap, fingerprint):
+    """
+    Load documents and create vector store.
+    
+    fingerprint is only part of the cache key: editing, adding or removing a
+    .txt file changes it and triggers a rebuild without pressing Reload.
+    """
+    chunks, metas = load_and_chunk(folder, chunk_size, chunk_overlap)
     return build_store(chunks, metas)
 
+@st.cache_resource(show_spinner=" Moving index to GPU...", max_entries=1)
+def get_gpu_store(_store, store_key):
+    """GPU copy of the vector store (falls back to the CPU store if no GPU). Only the current one is kept."""
+    return to_gpu(_store)
+
 @st.cache_resource(show_spinner=" Connecting to Groq...")
 def get_llm(_api_key, _model):
     """Initialize the LLM."""
     return init_groq(_api_key, _model)
 
+@st.cache_resource(show_spinner=False)
+def get_suggestion_embeddings(_store):
+    """
+    Embed the welcome suggestions once per process.
+    
+    The vectors only depend on the (fixed) embedding model, so a rebuilt
+    index or a new k reuses them without running the encoder again.
+    """
+    return _store.embeddings.embed_documents([query for _, query, _ in _SUGGESTIONS])
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_STORES)
+def get_suggestion_docs(_store, _vectors, store_key, k):
+    """
+    Retrieve documents for every welcome suggestion in one batched FAISS search.
+    
+    store_key identifies the index (_store itself is not hashed), so a rebuilt
+    store or a new k gets fresh results.
+    """
+    queries = [query for _, query, _ in _SUGGESTIONS]
+    return dict(zip(queries, similarity_search_by_vectors(_store, _vectors, k)))
+
 # Load vector store
-store = get_vector_store(data_folder, chunk_size, chunk_overlap)
+store_key = (data_folder, chunk_size, chunk_overlap, _folder_fingerprint(txt_files))
+store = get_vector_store(*store_key)
+if use_gpu_retrieval:
+    store = get_gpu_store(store, store_key)
+
+# Warm the suggestion embeddings so the first click skips the encoder
+suggestion_vectors = get_suggestion_embeddings(store)
 
 # Initialize LLM
 llm = get_llm(api_key, model_name)
 
 
-# ==============================================================================
-# CONSTANTS
-# ==============================================================================
-MAX_HISTORY_TURNS = 10
-
-
 # ==============================================================================
 # WELCOME SCREEN (when no messages)
 # ==============================================================================
 
-if not st.session_state.history:
+if not st.session_state.history and st.session_state.pending_query is None:
+    # Prefetch retrieval for all suggestions while the user reads
+    get_suggestion_docs(store, suggestion_vectors, store_key, k_docs)
+    
     st.markdown(f"""
         <div class="welcome-container">
             <span class="welcome-icon">✨</span>
@@ -973,19 +525,12 @@ if not st.session_state.history:
     # Suggestion buttons
     st.markdown('<div class="suggestions-grid">', unsafe_allow_html=True)
     
-    col1, col2, col3 = st.columns(3)
+    cols = st.columns(len(_SUGGESTIONS))
     
-    suggestions = [
-        "📋 What services are available?",
-        "💰 Tell me about the prices",
-        "🎯 What activities can I do?"
-    ]
-    
-    for col, suggestion_text in zip([col1, col2, col3], suggestions):
+    for col, (label, clean_text, key) in zip(cols, _SUGGESTIONS):
         with col:
-            if st.button(suggestion_text, use_container_width=True, key=f"suggestion_{suggestion_text}"):
-                clean_text = suggestion_text.split(" ", 1)[1] if " " in suggestion_text else suggestion_text
-                st.session_state.history.append(HumanMessage(content=clean_text))
+            if st.button(label, use_container_width=True, key=key):
+                st.session_state.pending_query = clean_text
                 st.rerun()
     
     st.markdown('</div>', unsafe_allow_html=True)
@@ -995,25 +540,12 @@ if not st.session_state.history:
 # DISPLAY CHAT HISTORY
 # ==============================================================================
 
-st.markdown('<div class="messages-container">', unsafe_allow_html=True)
-
-for message in st.session_state.history:
-    if isinstance(message, HumanMessage):
-        st.markdown(f"""
-            <div class="message-row">
-                <div class="message-avatar user">👤</div>
-                <div class="message-content">{message.content}</div>
-            </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-            <div class="message-row">
-                <div class="message-avatar assistant">🤖</div>
-                <div class="message-content">{message.content}</div>
-            </div>
-        """, unsafe_allow_html=True)
-
-st.markdown('</div>', unsafe_allow_html=True)
+# One markdown call for the whole history instead of one per message
+if st.session_state.history:
+    st.markdown(
+        _messages_html(*(_message_html(role, content) for role, content in st.session_state.history)),
+        unsafe_allow_html=True
+    )
 
 
 # ==============================================================================
@@ -1022,27 +554,24 @@ st.markdown('</div>', unsafe_allow_html=True)
 
 user_input = st.chat_input("Message RAG Chatbot...")
 
+# A clicked suggestion goes through the same path as a typed question
+if not user_input and st.session_state.pending_query is not None:
+    user_input = st.session_state.pending_query
+    st.session_state.pending_query = None
+
 if user_input:
     # Display user message immediately
-    st.markdown(f"""
-        <div class="messages-container">
-            <div class="message-row">
-                <div class="message-avatar user">👤</div>
-                <div class="message-content">{user_input}</div>
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_messages_html(_message_html("user", user_input)), unsafe_allow_html=True)
     
     # Add to history
-    st.session_state.history.append(HumanMessage(content=user_input))
-    
-    # Trim history if too long
-    if len(st.session_state.history) > MAX_HISTORY_TURNS * 2:
-        st.session_state.history = st.session_state.history[-MAX_HISTORY_TURNS * 2:]
+    _append_history("user", user_input)
     
     # ----- Retrieve relevant documents -----
     try:
-        docs = store.similarity_search(user_input, k=k_docs)
+        if user_input in _SUGGESTION_QUERIES:
+            docs = get_suggestion_docs(store, suggestion_vectors, store_key, k_docs)[user_input]
+        else:
+            docs = store.similarity_search(user_input, k=k_docs)
         context = "\n\n".join(doc.page_content for doc in docs)
         st.session_state.last_docs = docs
     except Exception as e:
@@ -1060,36 +589,28 @@ if user_input:
     
     # ----- Stream response -----
     response_placeholder = st.empty()
-    collected_response = ""
     start_time = time.time()
     
+    # Each render resends the whole reply, so _stream_reply throttles instead
+    # of rendering per token (O(n^2) over the reply otherwise)
+    def render_partial(text):
+        response_placeholder.markdown(
+            _messages_html(_message_html("assistant", text, "▌")),
+            unsafe_allow_html=True
+        )
+    
     try:
-        for chunk in llm.stream([HumanMessage(content=full_prompt)]):
-            collected_response += chunk.content or ""
-            response_placeholder.markdown(f"""
-                <div class="messages-container">
-                    <div class="message-row">
-                        <div class="message-avatar assistant">🤖</div>
-                        <div class="message-content">{collected_response}▌</div>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
+        collected_response = _stream_reply(llm, full_prompt, render_partial)
         
         # Calculate response time
         elapsed_time = time.time() - start_time
         
         # Final response with metadata
-        response_placeholder.markdown(f"""
-            <div class="messages-container">
-                <div class="message-row">
-                    <div class="message-avatar assistant">🤖</div>
-                    <div class="message-content">
-                        {collected_response}
-                        <div class="message-meta">⚡ {elapsed_time:.2f}s</div>
-                    </div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        meta = f'<div class="message-meta">⚡ {elapsed_time:.2f}s</div>'
+        response_placeholder.markdown(
+            _messages_html(_message_html("assistant", collected_response, meta)),
+            unsafe_allow_html=True
+        )
         
     except Exception as e:
         st.error(f" API Error: {e}")
@@ -1098,7 +619,7 @@ if user_input:
         response_placeholder.empty()
     
     # Add assistant response to history
-    st.session_state.history.append(AIMessage(content=collected_response))
+    _append_history("assistant", collected_response)
 
 
 # ==============================================================================
@@ -1109,13 +630,7 @@ if show_sources and st.session_state.last_docs:
     with st.expander(" Retrieved Source Documents"):
         for idx, doc in enumerate(st.session_state.last_docs, 1):
             source_name = doc.metadata.get('source', 'Unknown')
-            content_preview = doc.page_content[:400]
-            if len(doc.page_content) > 400:
-                content_preview += "..."
-            
-            st.markdown(f"""
-                <div class="source-card">
-                    <div class="source-card-title">{idx}. {source_name}</div>
-                    <div class="source-card-content">{content_preview}</div>
-                </div>
-            """, unsafe_allow_html=True)
\ No newline at end of file
+            st.markdown(
+                _source_card_html(idx, source_name, doc.page_content),
+                unsafe_allow_html=True
+            )
\ No newline at end of file
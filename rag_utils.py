@@ -4,13 +4,93 @@ Core RAG (Retrieval-Augmented Generation) utilities.
 Handles document loading, chunking, embedding, and LLM initialization.
 """
 import os
+import hashlib
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+import faiss
+import numpy as np
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.documents import Document
 from langchain_core.prompts import PromptTemplate
 from langchain_groq import ChatGroq
 
+# Read once at import; the environment does not change while the app runs
+DEFAULT_GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "")
+
+# Vector index: int8 vectors ranked by inner product (cosine on unit vectors);
+# exact search below ANN_MIN_CHUNKS, HNSW graph above
+INDEX_QTYPE = faiss.ScalarQuantizer.QT_8bit
+INDEX_METRIC = faiss.METRIC_INNER_PRODUCT
+ANN_MIN_CHUNKS = 10_000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Built indexes are saved next to this module (not the working directory),
+# one file per content hash; only the most recently used few are kept
+STORE_CACHE_DIR = Path(__file__).resolve().parent / ".faiss_cache"
+STORE_CACHE_MAX_ENTRIES = 4
+# Bump whenever index construction changes in a way the hash does not see
+# (e.g. embedding normalization), so stale cached indexes are not reused
+STORE_CACHE_VERSION = 1
+
+
+def _pick_device():
+    """Return "cuda" when torch sees a GPU, otherwise "cpu"."""
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, overlap: int):
+    """Shared splitter per (chunk_size, overlap), reused across reloads."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, 
+        chunk_overlap=overlap
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_embedder(model_name: str, device: str):
+    """Shared embedding model per (model_name, device); loading it takes seconds."""
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device},
+        encode_kwargs={"batch_size": 64, "normalize_embeddings": True},
+    )
+
+
+def _read_txt(fp: Path):
+    """
+    Read one .txt file and clean it for chunking.
+    
+    Args:
+        fp: Path to the text file
+    
+    Returns:
+        Cleaned text, or None if the file could not be read
+    """
+    try:
+        raw = fp.read_text(encoding="utf-8", errors="ignore")
+    except Exception as e:
+        print(f"Warning: Could not read {fp.name}: {e}")
+        return None
+    
+    # Clean: strip each line once, drop the empty ones. Stays on str so NBSP
+    # and form feeds (common in OCR output) count as whitespace/line breaks.
+    return "\n".join(filter(None, map(str.strip, raw.splitlines())))
+
+
 def load_and_chunk(folder: str, chunk_size: int = 500, overlap: int = 50):
     """
     Read .txt files from folder, clean text, and split into chunks.
@@ -24,55 +104,228 @@ def load_and_chunk(folder: str, chunk_size: int = 500, overlap: int = 50):
         Tuple of (chunks, metadata) lists
     """
     data_dir = Path(folder)
-    texts, metas = [], []
+    files = list(data_dir.glob("*.txt"))
+    splitter = _get_splitter(chunk_size, overlap)
     
-    for fp in data_dir.glob("*.txt"):
-        try:
-            raw = fp.read_text(encoding="utf-8", errors="ignore")
-        except Exception as e:
-            print(f"Warning: Could not read {fp.name}: {e}")
-            continue
+    chunks, chunk_metas = [], []
+    n_docs = 0
+    
+    # Read files concurrently; file I/O releases the GIL. Results are taken in
+    # file order, and at most `workers` reads are in flight (topped up as each
+    # text is chunked), so only about that many full texts are held at once.
+    workers = max(1, min(32, (os.cpu_count() or 1) * 4, len(files)))
+    remaining = iter(files)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        def top_up():
+            while len(pending) < workers:
+                fp = next(remaining, None)
+                if fp is None:
+                    return
+                pending.append((fp, ex.submit(_read_txt, fp)))
         
-        # Clean: remove empty lines, strip whitespace
-        cleaned = "\n".join([ln.strip() for ln in raw.splitlines() if ln.strip()])
-        texts.append(cleaned)
-        metas.append({"source": fp.name})
+        top_up()
+        while pending:
+            fp, future = pending.popleft()
+            cleaned = future.result()
+            top_up()
+            if cleaned is None:
+                continue
+            n_docs += 1
+            pieces = splitter.split_text(cleaned)
+            chunks.extend(pieces)
+            chunk_metas.extend([{"source": fp.name}] * len(pieces))
     
-    # Split into chunks
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size, 
-        chunk_overlap=overlap
-    )
+    print(f"Loaded {n_docs} documents, {len(chunks)} chunks")
+    return chunks, chunk_metas
+
+
+def _build_index(vecs: np.ndarray):
+    """
+    Build the FAISS index for a matrix of unit-length embeddings.
     
-    chunks, chunk_metas = [], []
-    for txt, meta in zip(texts, metas):
-        for c in splitter.split_text(txt):
-            chunks.append(c)
-            chunk_metas.append(meta)
+    Vectors are stored with 8-bit scalar quantization (4x smaller than FP32,
+    <1% recall loss). Inner product on unit vectors ranks by cosine similarity.
+    Small corpora use an exact scan, which beats graph traversal at that size;
+    from ANN_MIN_CHUNKS up an HNSW graph cuts per-query work at a small
+    recall cost (raise HNSW_EF_SEARCH to trade latency for recall).
     
-    print(f"Loaded {len(texts)} documents, {len(chunks)} chunks")
-    return chunks, chunk_metas
+    Args:
+        vecs: float32 array of shape (n_chunks, dim)
+    
+    Returns:
+        Trained FAISS index containing vecs
+    """
+    d = vecs.shape[1]
+    
+    if len(vecs) < ANN_MIN_CHUNKS:
+        index = faiss.IndexScalarQuantizer(d, INDEX_QTYPE, INDEX_METRIC)
+    else:
+        index = faiss.IndexHNSWSQ(d, INDEX_QTYPE, HNSW_M, INDEX_METRIC)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    
+    index.train(vecs)
+    index.add(vecs)
+    return index
+
+
+def _store_signature(chunks: list, metas: list, embed_model: str) -> str:
+    """Hash of everything that determines the index: format, model, index settings, chunks."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update((
+        f"v{STORE_CACHE_VERSION}|{embed_model}|{INDEX_QTYPE}|{INDEX_METRIC}|"
+        f"{ANN_MIN_CHUNKS}|{HNSW_M}|{HNSW_EF_CONSTRUCTION}|{HNSW_EF_SEARCH}"
+    ).encode())
+    for chunk, meta in zip(chunks, metas):
+        h.update(b"\0" + chunk.encode("utf-8") + b"\0" + repr(sorted(meta.items())).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _prune_store_cache(cache_dir: Path, keep: int):
+    """Delete all but the `keep` most recently used cached indexes."""
+    def last_used(p):
+        try:
+            return p.stat().st_mtime
+        except OSError:
+            return 0.0
+    
+    for old in sorted(cache_dir.glob("*.faiss"), key=last_used, reverse=True)[keep:]:
+        old.unlink(missing_ok=True)
 
 
-def build_store(chunks: list, metas: list, embed_model: str = "sentence-transformers/all-mpnet-base-v2"):
+def build_store(chunks: list, metas: list, embed_model: str = "sentence-transformers/all-mpnet-base-v2",
+                cache_dir=STORE_CACHE_DIR):
     """
-    Embed chunks and build a FAISS vector store.
+    Embed chunks and build a FAISS vector store over an int8 index.
+    
+    Built indexes are saved under cache_dir, keyed on a hash of the chunks,
+    metadata, model and index settings, so unchanged documents are loaded
+    from disk instead of being re-embedded. Only the FAISS index is cached;
+    the docstore is rebuilt from chunks and metas, so nothing is unpickled.
+    At most STORE_CACHE_MAX_ENTRIES indexes are kept.
     
     Args:
         chunks: List of text chunks
         metas: List of metadata dicts
         embed_model: HuggingFace model name for embeddings
+        cache_dir: Folder for saved indexes, or None to disable the disk cache
     
     Returns:
         FAISS vector store
     """
-    print(f"Building embeddings with {embed_model}...")
-    embeds = HuggingFaceEmbeddings(model_name=embed_model)
-    store = FAISS.from_texts(chunks, embeds, metadatas=metas)
+    device = _pick_device()
+    embeds = _get_embedder(embed_model, device)
+    
+    index = None
+    cache_file = None
+    if cache_dir:
+        cache_file = Path(cache_dir) / f"{_store_signature(chunks, metas, embed_model)}.faiss"
+        if cache_file.exists():
+            try:
+                index = faiss.read_index(str(cache_file))
+                if index.ntotal != len(chunks):
+                    raise ValueError(f"holds {index.ntotal} vectors, expected {len(chunks)}")
+                os.utime(cache_file)  # mark as recently used
+                print(f"Loaded cached index from {cache_file}")
+            except Exception as e:
+                print(f"Warning: Could not load cached index {cache_file.name}: {e}")
+                index = None
+    
+    if index is None:
+        print(f"Building embeddings with {embed_model} on {device}...")
+        vecs = np.ascontiguousarray(embeds.embed_documents(chunks), dtype=np.float32)
+        index = _build_index(vecs)
+        
+        if cache_file is not None:
+            tmp = None
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                # Write beside the target and rename, so concurrent readers
+                # never see a half-written index
+                fd, tmp = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+                os.close(fd)
+                faiss.write_index(index, tmp)
+                os.replace(tmp, cache_file)
+                _prune_store_cache(cache_file.parent, STORE_CACHE_MAX_ENTRIES)
+            except Exception as e:
+                print(f"Warning: Could not cache index: {e}")
+                if tmp is not None:
+                    Path(tmp).unlink(missing_ok=True)
+    
+    ids = [str(i) for i in range(len(chunks))]
+    docstore = InMemoryDocstore({
+        doc_id: Document(page_content=chunk, metadata=meta)
+        for doc_id, chunk, meta in zip(ids, chunks, metas)
+    })
+    store = FAISS(
+        embeds, index, docstore, dict(enumerate(ids)),
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+    )
+    
     print("Vector store ready")
     return store
 
 
+def to_gpu(store, device: int = 0):
+    """
+    Build a GPU copy of a store's FAISS index when a GPU is available.
+    
+    The GPU copier cannot move the int8 (scalar quantizer / HNSW) CPU
+    indexes, so the stored vectors are decoded into a flat inner-product
+    index, which the GPU searches exactly.
+    
+    Args:
+        store: FAISS vector store from build_store
+        device: GPU device number
+    
+    Returns:
+        New FAISS store sharing the docstore, or the original store if no
+        GPU (or no GPU build of faiss) is available
+    """
+    if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+        return store
+    
+    try:
+        flat = faiss.IndexFlatIP(store.index.d)
+        flat.add(store.index.reconstruct_n(0, store.index.ntotal))
+        gpu_index = faiss.index_cpu_to_gpu(faiss.StandardGpuResources(), device, flat)
+    except Exception as e:
+        print(f"Warning: GPU retrieval unavailable, using CPU: {e}")
+        return store
+    
+    print(f"Retrieval index moved to GPU {device}")
+    return FAISS(
+        store.embedding_function, gpu_index, store.docstore, store.index_to_docstore_id,
+        distance_strategy=store.distance_strategy,
+    )
+
+
+def similarity_search_by_vectors(store, vectors, k: int = 3):
+    """
+    Retrieve the top-k documents for several query vectors in one FAISS search.
+    
+    Args:
+        store: FAISS vector store from build_store
+        vectors: Query embeddings, one per query
+        k: Number of documents to return per query
+    
+    Returns:
+        List of document lists, one per query vector
+    """
+    queries = np.asarray(vectors, dtype=np.float32)
+    _, ids = store.index.search(queries, k)
+    
+    results = []
+    for row in ids:
+        # FAISS pads with -1 when the index holds fewer than k vectors
+        results.append([
+            store.docstore.search(store.index_to_docstore_id[i])
+            for i in row if i != -1
+        ])
+    return results
+
+
 def init_groq(api_key: str, model_name: str = "meta-llama/llama-4-scout-17b-16e-instruct"):
     """
     Initialize Groq LLM client (FREE API).
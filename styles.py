@@ -0,0 +1,677 @@
+# styles.py
+"""
+Theme palettes and the app stylesheet for the Streamlit UI.
+Kept in its own module so the formatted CSS survives Streamlit reruns.
+"""
+
+
+# ==============================================================================
+# ENHANCED THEME CONFIGURATION
+# ==============================================================================
+THEMES = {
+    "dark": {
+        "bg": "#0f0f0f",
+        "bg_gradient": "radial-gradient(ellipse at top, #1a1a2e 0%, #0f0f0f 50%)",
+        "sidebar_bg": "#161616",
+        "sidebar_border": "#2a2a2a",
+        "card_bg": "#1e1e1e",
+        "card_hover": "#252525",
+        "input_bg": "#1e1e1e",
+        "input_focus": "#252525",
+        "border": "#2a2a2a",
+        "border_hover": "#3a3a3a",
+        "text": "#f5f5f5",
+        "text_secondary": "#a0a0a0",
+        "text_muted": "#666666",
+        "accent": "#00d4aa",
+        "accent_hover": "#00f5c4",
+        "accent_subtle": "rgba(0, 212, 170, 0.1)",
+        "user_avatar_bg": "linear-gradient(135deg, #00d4aa 0%, #00a085 100%)",
+        "bot_avatar_bg": "linear-gradient(135deg, #2a2a3e 0%, #1a1a2e 100%)",
+        "shadow_sm": "0 2px 8px rgba(0, 0, 0, 0.3)",
+        "shadow_md": "0 4px 16px rgba(0, 0, 0, 0.4)",
+        "shadow_lg": "0 8px 32px rgba(0, 0, 0, 0.5)",
+        "glow": "0 0 20px rgba(0, 212, 170, 0.15)",
+        "accent_border": "rgba(0, 212, 170, 0.2)",
+        "accent_border_subtle": "rgba(0, 212, 170, 0.15)",
+        "accent_muted": "rgba(0, 212, 170, 0.2)",
+        "danger_subtle": "rgba(239, 68, 68, 0.1)",
+        "danger_border": "rgba(239, 68, 68, 0.2)",
+    },
+    "light": {
+        "bg": "#fafbfc",
+        "bg_gradient": "linear-gradient(180deg, #ffffff 0%, #f0f4f8 100%)",
+        "sidebar_bg": "#ffffff",
+        "sidebar_border": "#e8edf3",
+        "card_bg": "#ffffff",
+        "card_hover": "#f8fafc",
+        "input_bg": "#ffffff",
+        "input_focus": "#f8fafc",
+        "border": "#e2e8f0",
+        "border_hover": "#cbd5e1",
+        "text": "#1e293b",
+        "text_secondary": "#64748b",
+        "text_muted": "#94a3b8",
+        "accent": "#0891b2",
+        "accent_hover": "#06b6d4",
+        "accent_subtle": "rgba(8, 145, 178, 0.08)",
+        "user_avatar_bg": "linear-gradient(135deg, #0891b2 0%, #0e7490 100%)",
+        "bot_avatar_bg": "linear-gradient(135deg, #f1f5f9 0%, #e2e8f0 100%)",
+        "shadow_sm": "0 1px 3px rgba(0, 0, 0, 0.08), 0 1px 2px rgba(0, 0, 0, 0.04)",
+        "shadow_md": "0 4px 12px rgba(0, 0, 0, 0.08), 0 2px 4px rgba(0, 0, 0, 0.04)",
+        "shadow_lg": "0 8px 24px rgba(0, 0, 0, 0.1), 0 4px 8px rgba(0, 0, 0, 0.04)",
+        "glow": "0 0 20px rgba(8, 145, 178, 0.1)",
+        "accent_border": "rgba(8, 145, 178, 0.15)",
+        "accent_border_subtle": "rgba(8, 145, 178, 0.1)",
+        "accent_muted": "rgba(8, 145, 178, 0.12)",
+        "danger_subtle": "rgba(239, 68, 68, 0.06)",
+        "danger_border": "rgba(239, 68, 68, 0.15)",
+    }
+}
+
+
+# ==============================================================================
+# ENHANCED CSS STYLING
+# ==============================================================================
+_CSS_TEMPLATE = """
+<style>
+    /* ========== FONTS ========== */
+    @import url('https://fonts.googleapis.com/css2?family=Plus+Jakarta+Sans:wght@400;500;600;700&family=JetBrains+Mono:wght@400;500&display=swap');
+    
+    * {{
+        font-family: 'Plus Jakarta Sans', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+    }}
+    
+    code, pre, .stCode {{
+        font-family: 'JetBrains Mono', monospace !important;
+    }}
+    
+    /* ========== MAIN BACKGROUND ========== */
+    .stApp {{
+        background: {bg_gradient};
+        background-attachment: fixed;
+    }}
+    
+    /* ========== SIDEBAR ========== */
+    [data-testid="stSidebar"] {{
+        background: {sidebar_bg};
+        border-right: 1px solid {sidebar_border};
+        box-shadow: {shadow_md};
+    }}
+    
+    [data-testid="stSidebar"] > div:first-child {{
+        padding: 1.5rem 1rem;
+    }}
+    
+    /* Sidebar text */
+    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] p,
+    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] span {{
+        color: {text_secondary};
+    }}
+    
+    [data-testid="stSidebar"] h1, 
+    [data-testid="stSidebar"] h2, 
+    [data-testid="stSidebar"] h3 {{
+        color: {text} !important;
+    }}
+    
+    /* ========== SIDEBAR TITLE ========== */
+    .sidebar-title {{
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        margin-bottom: 4px;
+    }}
+    
+    .sidebar-title-icon {{
+        font-size: 24px;
+    }}
+    
+    .sidebar-title-text {{
+        color: {text};
+        font-size: 18px;
+        font-weight: 700;
+        letter-spacing: -0.3px;
+    }}
+    
+    .sidebar-subtitle {{
+        color: {text_muted};
+        font-size: 13px;
+        margin-left: 34px;
+        margin-top: -2px;
+    }}
+    
+    /* ========== SECTION LABELS ========== */
+    .section-label {{
+        color: {text_muted};
+        font-size: 11px;
+        font-weight: 700;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+        margin: 24px 0 12px 0;
+        padding-left: 2px;
+    }}
+    
+    /* ========== STATUS INDICATORS ========== */
+    .status-container {{
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        margin: 10px 0;
+        padding: 10px 14px;
+        background: {accent_subtle};
+        border-radius: 10px;
+        border: 1px solid {accent_border};
+    }}
+    
+    .status-container.offline {{
+        background: {danger_subtle};
+        border-color: {danger_border};
+    }}
+    
+    .status-dot {{
+        width: 8px;
+        height: 8px;
+        border-radius: 50%;
+        flex-shrink: 0;
+        animation: pulse 2s infinite;
+    }}
+    
+    .status-dot.online {{
+        background-color: {accent};
+        box-shadow: 0 0 8px {accent};
+    }}
+    
+    .status-dot.offline {{
+        background-color: #ef4444;
+        animation: none;
+    }}
+    
+    @keyframes pulse {{
+        0%, 100% {{ opacity: 1; }}
+        50% {{ opacity: 0.5; }}
+    }}
+    
+    .status-text {{
+        color: {text_secondary};
+        font-size: 13px;
+        font-weight: 500;
+    }}
+    
+    /* ========== DIVIDER ========== */
+    .divider {{
+        height: 1px;
+        background: linear-gradient(90deg, transparent, {border}, transparent);
+        margin: 20px 0;
+        border: none;
+    }}
+    
+    /* ========== HEADER ========== */
+    .chat-header {{
+        text-align: center;
+        padding: 32px 20px;
+        margin-bottom: 24px;
+        background: {card_bg};
+        border-radius: 16px;
+        border: 1px solid {border};
+        box-shadow: {shadow_sm};
+        max-width: 800px;
+        margin-left: auto;
+        margin-right: auto;
+    }}
+    
+    .chat-header-title {{
+        color: {text};
+        font-size: 22px;
+        font-weight: 700;
+        margin: 0;
+        letter-spacing: -0.5px;
+    }}
+    
+    .chat-header-subtitle {{
+        color: {text_secondary};
+        font-size: 14px;
+        margin: 8px 0 0 0;
+        font-weight: 500;
+    }}
+    
+    /* ========== WELCOME SCREEN ========== */
+    .welcome-container {{
+        text-align: center;
+        padding: 80px 24px;
+        max-width: 640px;
+        margin: 0 auto;
+    }}
+    
+    .welcome-icon {{
+        font-size: 56px;
+        margin-bottom: 24px;
+        display: block;
+    }}
+    
+    .welcome-title {{
+        color: {text};
+        font-size: 32px;
+        font-weight: 700;
+        margin: 0 0 16px 0;
+        letter-spacing: -0.5px;
+        line-height: 1.2;
+    }}
+    
+    .welcome-subtitle {{
+        color: {text_secondary};
+        font-size: 16px;
+        margin: 0;
+        line-height: 1.6;
+        font-weight: 500;
+    }}
+    
+    .welcome-link {{
+        color: {accent};
+        text-decoration: none;
+        font-weight: 600;
+        transition: all 0.2s ease;
+    }}
+    
+    .welcome-link:hover {{
+        color: {accent_hover};
+        text-decoration: underline;
+    }}
+    
+    /* ========== CHAT MESSAGES ========== */
+    .messages-container {{
+        max-width: 800px;
+        margin: 0 auto;
+        padding: 0 16px;
+    }}
+    
+    .message-row {{
+        display: flex;
+        gap: 16px;
+        padding: 28px 24px;
+        margin: 12px 0;
+        background: {card_bg};
+        border-radius: 16px;
+        border: 1px solid {border};
+        box-shadow: {shadow_sm};
+        transition: all 0.2s ease;
+    }}
+    
+    .message-row:hover {{
+        box-shadow: {shadow_md};
+        border-color: {border_hover};
+    }}
+    
+    .message-avatar {{
+        width: 40px;
+        height: 40px;
+        border-radius: 12px;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-size: 18px;
+        flex-shrink: 0;
+        box-shadow: {shadow_sm};
+    }}
+    
+    .message-avatar.user {{
+        background: {user_avatar_bg};
+        color: white;
+    }}
+    
+    .message-avatar.assistant {{
+        background: {bot_avatar_bg};
+        border: 1px solid {border};
+    }}
+    
+    .message-content {{
+        flex: 1;
+        color: {text};
+        font-size: 15px;
+        line-height: 1.75;
+        padding-top: 8px;
+    }}
+    
+    .message-meta {{
+        color: {text_muted};
+        font-size: 12px;
+        margin-top: 12px;
+        padding-top: 12px;
+        border-top: 1px solid {border};
+        font-weight: 500;
+    }}
+    
+    /* ========== SUGGESTION BUTTONS ========== */
+    .suggestions-grid {{
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+        gap: 12px;
+        margin-top: 40px;
+        max-width: 700px;
+        margin-left: auto;
+        margin-right: auto;
+    }}
+    
+    /* ========== INPUT FIELDS ========== */
+    .stTextInput > div > div > input {{
+        background: {input_bg} !important;
+        border: 2px solid {border} !important;
+        border-radius: 12px !important;
+        color: {text} !important;
+        font-size: 14px !important;
+        padding: 12px 16px !important;
+        font-weight: 500 !important;
+        transition: all 0.2s ease !important;
+        box-shadow: {shadow_sm} !important;
+    }}
+    
+    .stTextInput > div > div > input:focus {{
+        border-color: {accent} !important;
+        box-shadow: {glow} !important;
+        background: {input_focus} !important;
+    }}
+    
+    .stTextInput > div > div > input::placeholder {{
+        color: {text_muted} !important;
+    }}
+    
+    /* ========== SELECT BOX ========== */
+    .stSelectbox > div > div {{
+        background: {input_bg} !important;
+        border: 2px solid {border} !important;
+        border-radius: 12px !important;
+        box-shadow: {shadow_sm} !important;
+    }}
+    
+    .stSelectbox > div > div:hover {{
+        border-color: {border_hover} !important;
+    }}
+    
+    .stSelectbox > div > div > div {{
+        color: {text} !important;
+        font-weight: 500 !important;
+    }}
+    
+    .stSelectbox label {{
+        color: {text_secondary} !important;
+        font-weight: 600 !important;
+    }}
+    
+    /* ========== SLIDERS ========== */
+    .stSlider label {{
+        color: {text_secondary} !important;
+        font-size: 13px !important;
+        font-weight: 600 !important;
+    }}
+    
+    .stSlider > div > div > div > div {{
+        background: {border} !important;
+    }}
+    
+    .stSlider > div > div > div > div > div {{
+        background: {accent} !important;
+    }}
+    
+    /* ========== BUTTONS ========== */
+    .stButton > button {{
+        background: {card_bg} !important;
+        color: {text} !important;
+        border: 2px solid {border} !important;
+        border-radius: 12px !important;
+        font-size: 14px !important;
+        font-weight: 600 !important;
+        padding: 10px 20px !important;
+        transition: all 0.2s ease !important;
+        box-shadow: {shadow_sm} !important;
+    }}
+    
+    .stButton > button:hover {{
+        background: {card_hover} !important;
+        border-color: {accent} !important;
+        box-shadow: {shadow_md} !important;
+        transform: translateY(-1px) !important;
+    }}
+    
+    .stButton > button:active {{
+        transform: translateY(0) !important;
+    }}
+    
+    /* Primary action button style */
+    .primary-btn > button {{
+        background: {user_avatar_bg} !important;
+        color: white !important;
+        border: none !important;
+    }}
+    
+    .primary-btn > button:hover {{
+        filter: brightness(1.1) !important;
+    }}
+    
+    /* ========== RADIO BUTTONS (Theme Toggle) ========== */
+    .stRadio > div {{
+        gap: 8px !important;
+        background: {card_bg};
+        padding: 8px;
+        border-radius: 12px;
+        border: 1px solid {border};
+    }}
+    
+    .stRadio label {{
+        color: {text} !important;
+        font-weight: 500 !important;
+    }}
+    
+    .stRadio > div > label > div:first-child {{
+        background-color: {accent} !important;
+    }}
+    
+    /* ========== CHAT INPUT ========== */
+    [data-testid="stChatInput"] > div {{
+        background: {input_bg} !important;
+        border: 2px solid {border} !important;
+        border-radius: 16px !important;
+        box-shadow: {shadow_md} !important;
+        transition: all 0.2s ease !important;
+    }}
+    
+    [data-testid="stChatInput"] > div:focus-within {{
+        border-color: {accent} !important;
+        box-shadow: {glow}, {shadow_md} !important;
+    }}
+    
+    [data-testid="stChatInput"] textarea {{
+        color: {text} !important;
+        font-size: 15px !important;
+        font-weight: 500 !important;
+    }}
+    
+    [data-testid="stChatInput"] textarea::placeholder {{
+        color: {text_muted} !important;
+    }}
+    
+    /* ========== EXPANDER ========== */
+    .streamlit-expanderHeader {{
+        background: {card_bg} !important;
+        border: 2px solid {border} !important;
+        border-radius: 12px !important;
+        color: {text_secondary} !important;
+        font-size: 14px !important;
+        font-weight: 600 !important;
+        padding: 14px 16px !important;
+        transition: all 0.2s ease !important;
+    }}
+    
+    .streamlit-expanderHeader:hover {{
+        color: {text} !important;
+        border-color: {accent} !important;
+        box-shadow: {shadow_sm} !important;
+    }}
+    
+    .streamlit-expanderContent {{
+        background: {sidebar_bg} !important;
+        border: 2px solid {border} !important;
+        border-top: none !important;
+        border-radius: 0 0 12px 12px !important;
+        padding: 16px !important;
+    }}
+    
+    /* ========== SOURCE DOCUMENTS ========== */
+    .source-card {{
+        background: {card_bg};
+        border: 2px solid {border};
+        border-radius: 12px;
+        padding: 18px;
+        margin: 12px 0;
+        transition: all 0.2s ease;
+        box-shadow: {shadow_sm};
+    }}
+    
+    .source-card:hover {{
+        border-color: {accent};
+        box-shadow: {shadow_md};
+    }}
+    
+    .source-card-title {{
+        color: {accent};
+        font-size: 12px;
+        font-weight: 700;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+        margin-bottom: 10px;
+        display: flex;
+        align-items: center;
+        gap: 8px;
+    }}
+    
+    .source-card-title::before {{
+        content: '📄';
+        font-size: 14px;
+    }}
+    
+    .source-card-content {{
+        color: {text};
+        font-size: 14px;
+        line-height: 1.7;
+    }}
+    
+    /* ========== ALERTS ========== */
+    .stAlert {{
+        background: {card_bg} !important;
+        border: 2px solid {border} !important;
+        border-radius: 12px !important;
+        box-shadow: {shadow_sm} !important;
+    }}
+    
+    /* ========== CHECKBOX ========== */
+    .stCheckbox label {{
+        color: {text} !important;
+        font-weight: 500 !important;
+    }}
+    
+    .stCheckbox > label > div:first-child {{
+        background-color: {card_bg} !important;
+        border: 2px solid {border} !important;
+        border-radius: 6px !important;
+    }}
+    
+    /* ========== HIDE STREAMLIT DEFAULTS ========== */
+    #MainMenu {{ visibility: hidden; }}
+    footer {{ visibility: hidden; }}
+    header {{ visibility: hidden; }}
+    
+    /* ========== CUSTOM SCROLLBAR ========== */
+    ::-webkit-scrollbar {{
+        width: 10px;
+        height: 10px;
+    }}
+    
+    ::-webkit-scrollbar-track {{
+        background: {bg};
+        border-radius: 5px;
+    }}
+    
+    ::-webkit-scrollbar-thumb {{
+        background: {border};
+        border-radius: 5px;
+        border: 2px solid {bg};
+    }}
+    
+    ::-webkit-scrollbar-thumb:hover {{
+        background: {text_muted};
+    }}
+    
+    /* ========== API LINK ========== */
+    .api-link {{
+        display: inline-flex;
+        align-items: center;
+        gap: 6px;
+        color: {accent};
+        font-size: 13px;
+        font-weight: 600;
+        text-decoration: none;
+        padding: 8px 14px;
+        background: {accent_subtle};
+        border-radius: 8px;
+        border: 1px solid {accent_border};
+        transition: all 0.2s ease;
+        margin-top: 8px;
+    }}
+    
+    .api-link:hover {{
+        background: {accent_muted};
+        transform: translateX(4px);
+    }}
+    
+    /* ========== FOOTER ========== */
+    .sidebar-footer {{
+        text-align: center;
+        padding: 16px;
+        margin-top: 20px;
+        background: {accent_subtle};
+        border-radius: 12px;
+        border: 1px solid {accent_border_subtle};
+    }}
+    
+    .sidebar-footer p {{
+        color: {text_secondary};
+        font-size: 12px;
+        margin: 0;
+        font-weight: 500;
+    }}
+    
+    .sidebar-footer a {{
+        color: {accent};
+        text-decoration: none;
+        font-weight: 600;
+    }}
+    
+    .sidebar-footer a:hover {{
+        text-decoration: underline;
+    }}
+    
+    /* ========== DOC COUNT BADGE ========== */
+    .doc-badge {{
+        display: inline-flex;
+        align-items: center;
+        gap: 8px;
+        padding: 10px 14px;
+        background: {accent_subtle};
+        border-radius: 10px;
+        border: 1px solid {accent_border};
+        margin-top: 8px;
+    }}
+    
+    .doc-badge-icon {{
+        font-size: 16px;
+    }}
+    
+    .doc-badge-text {{
+        color: {text_secondary};
+        font-size: 13px;
+        font-weight: 600;
+    }}
+</style>
+"""
+
+# Both stylesheets are formatted once at import; reruns only do a dict lookup
+CSS = {name: _CSS_TEMPLATE.format_map(theme) for name, theme in THEMES.items()}
@@ -6,12 +6,19 @@ Validates retrieval quality and answer generation.
 
 import os
 import re
+import faiss
+import numpy as np
 import pytest
+from langchain_core.documents import Document
 from langchain_core.messages import HumanMessage
 
 import sys
 sys.path.insert(0, '..')
-from rag_utils import load_and_chunk, build_store, init_groq, prompt_tpl
+import rag_utils
+from rag_utils import (
+    load_and_chunk, build_store, init_groq, prompt_tpl, similarity_search_by_vectors,
+    ANN_MIN_CHUNKS, _build_index, _prune_store_cache, _read_txt,
+)
 
 
 # ────────────── Configuration ──────────────
@@ -43,15 +50,20 @@ def normalize(text: str) -> str:
 
 
 @pytest.fixture(scope="module")
-def rag_components():
+def store_only():
+    """Build the vector store once for all tests (bypassing the disk cache)."""
+    chunks, metas = load_and_chunk(DATA_FOLDER, 500, 50)
+    return build_store(chunks, metas, EMBED_MODEL, cache_dir=None)
+
+
+@pytest.fixture(scope="module")
+def rag_components(store_only):
     """Initialize RAG components once for all tests."""
     if not GROQ_API_KEY:
         pytest.skip("GROQ_API_KEY not set")
     
-    chunks, metas = load_and_chunk(DATA_FOLDER, 500, 50)
-    store = build_store(chunks, metas, EMBED_MODEL)
     llm = init_groq(GROQ_API_KEY, MODEL_NAME)
-    return store, llm
+    return store_only, llm
 
 
 @pytest.mark.parametrize("query,expected", TEST_CASES.items())
@@ -68,6 +80,7 @@ def test_rag_answer(rag_components, query, expected):
     response = llm.invoke([HumanMessage(content=prompt)]).content
     
     # Check for expected content
+    # Substring match: expectations are stems ("pack" must accept "packing")
     norm_resp = normalize(response)
     expected_words = re.findall(r"\w+", normalize(expected))
     missing = [w for w in expected_words if w not in norm_resp]
@@ -78,27 +91,102 @@ def test_rag_answer(rag_components, query, expected):
     )
 
 
-def test_retrieval_returns_documents():
+def test_retrieval_returns_documents(store_only):
     """Test that retrieval returns the expected number of documents."""
-    chunks, metas = load_and_chunk(DATA_FOLDER, 500, 50)
-    store = build_store(chunks, metas, EMBED_MODEL)
-    
-    docs = store.similarity_search("travel information", k=3)
+    docs = store_only.similarity_search("travel information", k=3)
     
     assert len(docs) > 0, "No documents retrieved"
     assert len(docs) <= 3, f"Expected max 3 docs, got {len(docs)}"
 
 
-def test_documents_have_metadata():
+def test_documents_have_metadata(store_only):
     """Test that retrieved documents have source metadata."""
-    chunks, metas = load_and_chunk(DATA_FOLDER, 500, 50)
-    store = build_store(chunks, metas, EMBED_MODEL)
-    
-    docs = store.similarity_search("information", k=1)
+    docs = store_only.similarity_search("information", k=1)
     
     assert len(docs) > 0, "No documents retrieved"
     assert "source" in docs[0].metadata, "Missing source metadata"
 
 
+def test_batched_search_matches_similarity_search(store_only):
+    """Test that one batched search returns what per-query searches return."""
+    queries = ["travel information", "spa treatments", "WiFi password"]
+    vectors = [store_only.embeddings.embed_query(q) for q in queries]
+    
+    batched = similarity_search_by_vectors(store_only, vectors, k=3)
+    
+    assert len(batched) == len(queries)
+    for query, docs in zip(queries, batched):
+        expected = [d.page_content for d in store_only.similarity_search(query, k=3)]
+        assert [d.page_content for d in docs] == expected, f"Mismatch for '{query}'"
+
+
+def test_batched_search_drops_padding(store_only):
+    """Test that FAISS -1 padding is dropped when k exceeds the index size."""
+    n = store_only.index.ntotal
+    vectors = [store_only.embeddings.embed_query("information")]
+    
+    (docs,) = similarity_search_by_vectors(store_only, vectors, k=n + 5)
+    
+    assert len(docs) == n, f"Expected {n} docs, got {len(docs)}"
+    assert all(isinstance(d, Document) for d in docs), "Padding leaked into results"
+
+
+def test_hnsw_index_finds_nearest_neighbours():
+    """Test that corpora at ANN_MIN_CHUNKS use HNSW and still find true neighbours."""
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((ANN_MIN_CHUNKS, 32)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    queries = vecs[:100] + rng.standard_normal((100, 32)).astype(np.float32) * 0.05
+    
+    index = _build_index(vecs)
+    _, ids = index.search(queries, 1)
+    
+    assert isinstance(index, faiss.IndexHNSWSQ), f"Got {type(index).__name__}"
+    exact = np.argmax(queries @ vecs.T, axis=1)
+    recall = np.mean(ids[:, 0] == exact)
+    assert recall >= 0.95, f"HNSW recall@1 too low: {recall:.2f}"
+    
+    small = _build_index(vecs[:100])
+    assert isinstance(small, faiss.IndexScalarQuantizer), "Small corpora should use exact search"
+
+
+def test_read_txt_cleans_ocr_whitespace(tmp_path):
+    """Test that NBSP-only lines are dropped and form feeds split lines."""
+    path = tmp_path / "ocr.txt"
+    path.write_text("  a\xa0\n\xa0\xa0\n\nb\x0cc\r\n", encoding="utf-8")
+    
+    assert _read_txt(path) == "a\nb\nc"
+
+
+def test_store_cache_round_trip(tmp_path, monkeypatch):
+    """Test that a cached index is loaded back instead of rebuilt."""
+    chunks, metas = load_and_chunk(DATA_FOLDER, 500, 50)
+    built = build_store(chunks, metas, EMBED_MODEL, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("*.faiss"))) == 1, "Index was not cached"
+    
+    def no_rebuild(vecs):
+        raise AssertionError("Index was rebuilt despite a cache hit")
+    monkeypatch.setattr(rag_utils, "_build_index", no_rebuild)
+    loaded = build_store(chunks, metas, EMBED_MODEL, cache_dir=tmp_path)
+    
+    query = "travel information"
+    expected = [(d.page_content, d.metadata) for d in built.similarity_search(query, k=3)]
+    actual = [(d.page_content, d.metadata) for d in loaded.similarity_search(query, k=3)]
+    assert actual == expected, "Cached store returned different results"
+
+
+def test_store_cache_keeps_most_recent(tmp_path):
+    """Test that pruning keeps only the most recently used indexes."""
+    for i in range(6):
+        path = tmp_path / f"{i}.faiss"
+        path.write_bytes(b"")
+        os.utime(path, (i, i))
+    
+    _prune_store_cache(tmp_path, 4)
+    
+    kept = sorted(p.stem for p in tmp_path.glob("*.faiss"))
+    assert kept == ["2", "3", "4", "5"], f"Unexpected cache entries: {kept}"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])